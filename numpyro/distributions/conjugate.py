@@ -1,25 +1,266 @@
 # Copyright Contributors to the Pyro project.
 # SPDX-License-Identifier: Apache-2.0
 
-from jax import lax, nn, random
+from functools import lru_cache
+
+import numpy as np
+
+from jax import jit, lax, nn, random
 import jax.numpy as jnp
-from jax.scipy.special import betainc, betaln, gammaln
+from jax.scipy.special import betainc, gammaln
 
 from numpyro.distributions import constraints
 from numpyro.distributions.continuous import Beta, Dirichlet, Gamma
-from numpyro.distributions.discrete import (
-    BinomialProbs,
-    MultinomialProbs,
-    Poisson,
-    ZeroInflatedDistribution,
-)
+from numpyro.distributions.discrete import BinomialProbs, ZeroInflatedDistribution
 from numpyro.distributions.distribution import Distribution
-from numpyro.distributions.util import is_prng_key, promote_shapes, validate_sample
+from numpyro.distributions.util import (
+    binomial,
+    is_prng_key,
+    lazy_property,
+    multinomial,
+    promote_shapes,
+    validate_sample,
+)
+from numpyro.util import not_jax_tracer
+
+_STIRLING_THRESHOLD = 30.0
+
+
+def _log_gamma_ratio(alpha, value, gammaln_alpha=None):
+    # computes gammaln(alpha + value) - gammaln(alpha); for large alpha, we use the
+    # difference of Stirling series, which avoids the cancellation between the two
+    # large gammaln terms (ref: https://dlmf.nist.gov/5.11)
+    if gammaln_alpha is None:
+        gammaln_alpha = gammaln(alpha)
+    exact = gammaln(alpha + value) - gammaln_alpha
+    # NB: the series is evaluated at a safe value for small alpha, otherwise its
+    # infinite derivatives would turn the gradient of the masked branch into NaN
+    use_series = alpha > _STIRLING_THRESHOLD
+    safe_alpha = jnp.where(use_series, alpha, _STIRLING_THRESHOLD + 1)
+    x = safe_alpha + value
+
+    def series(y):
+        y2 = y * y
+        return (1 / 12 - (1 / 360 - 1 / (1260 * y2)) / y2) / y
+
+    approx = (
+        (x - 0.5) * jnp.log1p(value / safe_alpha)
+        + value * (jnp.log(safe_alpha) - 1)
+        + series(x)
+        - series(safe_alpha)
+    )
+    return jnp.where(use_series, approx, exact)
+
+
+def _compute_dtype(dtype):
+    # The log densities below are differences of large gammaln terms, which lose
+    # all precision in half precision. So while their result follows the dtype of
+    # the parameters (e.g. bfloat16), they are evaluated in at least float32. Inside
+    # a fused kernel, this keeps the memory traffic of the low precision inputs and
+    # outputs, and integer counts above 256 (not representable in bfloat16) stay
+    # exact.
+    return jnp.promote_types(dtype, jnp.float32)
+
+
+def _astype(x, dtype):
+    return jnp.asarray(x).astype(dtype)
+
+
+def _to_compute_dtype(x, *params):
+    return _astype(x, _compute_dtype(jnp.result_type(*params, float)))
 
 
 def _log_beta_1(alpha, value):
-    # XXX: support sparse `value`
-    return gammaln(1 + value) + gammaln(alpha) - gammaln(value + alpha)
+    return gammaln(1 + value) - _log_gamma_ratio(alpha, value)
+
+
+# NB: the log density kernels below are jitted so that, when evaluated eagerly
+# (e.g. to compute log likelihoods of held-out data), XLA compiles each of them
+# into a single fused loop instead of dispatching one op at a time. Under an
+# outer `jit`, they are simply inlined.
+@jit
+def _beta_binomial_log_prob(
+    concentration1, concentration0, total_count, log_norm, value
+):
+    out_dtype = jnp.result_type(concentration1, concentration0, float)
+    dtype = _compute_dtype(out_dtype)
+    concentration1 = _astype(concentration1, dtype)
+    concentration0 = _astype(concentration0, dtype)
+    n = _astype(total_count, dtype)
+    value = _astype(value, dtype)
+    log_prob = (
+        -gammaln(value + 1)
+        - gammaln(n - value + 1)
+        + gammaln(value + concentration1)
+        + gammaln(n - value + concentration0)
+        + log_norm
+    )
+    return log_prob.astype(out_dtype)
+
+
+# largest `total_count` for which BetaBinomial tabulates log factorials
+_MAX_LOG_FACTORIAL_TABLE = 10000
+
+
+@jit
+def _beta_binomial_log_prob_table(
+    concentration1, concentration0, total_count, log_norm, log_factorial, value
+):
+    # same as `_beta_binomial_log_prob` for integer `value`, but the log binomial
+    # coefficient is gathered from a table of log factorials
+    out_dtype = jnp.result_type(concentration1, concentration0, float)
+    dtype = _compute_dtype(out_dtype)
+    concentration1 = _astype(concentration1, dtype)
+    concentration0 = _astype(concentration0, dtype)
+    # NB: narrow count dtypes (e.g. uint8) are promoted first, so that neither
+    # `total_count` nor `total_count - value` wraps around
+    value = value.astype(jnp.promote_types(value.dtype, jnp.result_type(int)))
+    n = _astype(total_count, value.dtype)
+    log_factorial = _astype(log_factorial, dtype)
+
+    def log_fact(x):
+        return jnp.take(log_factorial, x, mode="clip")
+
+    log_prob = (
+        -log_fact(value)
+        - log_fact(n - value)
+        + gammaln(value + concentration1)
+        + gammaln(n - value + concentration0)
+        + log_norm
+    )
+    log_prob = jnp.where((value >= 0) & (value <= n), log_prob, -jnp.inf)
+    return log_prob.astype(out_dtype)
+
+
+def _dirichlet_multinomial_log_factor(concentration, value, gammaln_concentration):
+    # per-category term of the DirichletMultinomial log density; it is zero for
+    # zero counts
+    return _log_gamma_ratio(concentration, value, gammaln_concentration) - gammaln(
+        value + 1
+    )
+
+
+@jit
+def _dirichlet_multinomial_log_prob(
+    concentration, gammaln_concentration, gammaln_concentration_sum, value
+):
+    out_dtype = jnp.result_type(concentration, float)
+    dtype = _compute_dtype(out_dtype)
+    concentration = _astype(concentration, dtype)
+    value = _astype(value, dtype)
+    total_count = value.sum(-1)
+    log_factors = _dirichlet_multinomial_log_factor(
+        concentration, value, gammaln_concentration
+    )
+    log_prob = (
+        gammaln(total_count + 1)
+        + gammaln_concentration_sum
+        - gammaln(total_count + concentration.sum(-1))
+        + log_factors.sum(-1)
+    )
+    return log_prob.astype(out_dtype)
+
+
+# for a small number of categories, the reduction over the last axis is unrolled
+_MAX_UNROLL_CATEGORIES = 16
+
+
+@lru_cache(maxsize=None)
+def _make_dirichlet_multinomial_log_prob(num_categories):
+    # specialized version of `_dirichlet_multinomial_log_prob` for a fixed number of
+    # categories, whose per-category terms are summed as a plain elementwise op tree
+    @jit
+    def log_prob_fn(
+        concentration, gammaln_concentration, gammaln_concentration_sum, value
+    ):
+        out_dtype = jnp.result_type(concentration, float)
+        dtype = _compute_dtype(out_dtype)
+        concentration = _astype(concentration, dtype)
+        value = _astype(value, dtype)
+        total_count = 0
+        concentration_sum = 0
+        log_factors = 0
+        for k in range(num_categories):
+            alpha_k = concentration[..., k]
+            value_k = value[..., k]
+            total_count = total_count + value_k
+            concentration_sum = concentration_sum + alpha_k
+            log_factors = log_factors + _dirichlet_multinomial_log_factor(
+                alpha_k, value_k, gammaln_concentration[..., k]
+            )
+        log_prob = (
+            gammaln(total_count + 1)
+            + gammaln_concentration_sum
+            - gammaln(total_count + concentration_sum)
+            + log_factors
+        )
+        return log_prob.astype(out_dtype)
+
+    return log_prob_fn
+
+
+# for a large number of categories, the per-category terms are accumulated in a scan
+_MIN_SCAN_CATEGORIES = 1024
+
+
+@jit
+def _dirichlet_multinomial_log_prob_scan(
+    concentration, gammaln_concentration, gammaln_concentration_sum, value
+):
+    # same as `_dirichlet_multinomial_log_prob`, but the category axis is moved to
+    # the front and scanned over, so that only a batch-sized accumulator is kept
+    # alive instead of the full `batch_shape + (K,)` buffer of per-category terms
+    out_dtype = jnp.result_type(concentration, float)
+    dtype = _compute_dtype(out_dtype)
+    concentration = _astype(concentration, dtype)
+    value = _astype(value, dtype)
+    shape = lax.broadcast_shapes(jnp.shape(value), jnp.shape(concentration))
+
+    def scan_fn(carry, x):
+        # NB: parameters are broadcast against the counts of each category here
+        # rather than to the full shape up front
+        return carry + _dirichlet_multinomial_log_factor(*x), None
+
+    xs = (
+        jnp.moveaxis(concentration, -1, 0),
+        jnp.moveaxis(value, -1, 0),
+        jnp.moveaxis(gammaln_concentration, -1, 0),
+    )
+    log_factors, _ = lax.scan(scan_fn, jnp.zeros(shape[:-1], dtype=dtype), xs)
+    total_count = value.sum(-1)
+    log_prob = (
+        gammaln(total_count + 1)
+        + gammaln_concentration_sum
+        - gammaln(total_count + concentration.sum(-1))
+        + log_factors
+    )
+    return log_prob.astype(out_dtype)
+
+
+@jit
+def _gamma_poisson_log_prob(
+    concentration,
+    rate,
+    gammaln_concentration,
+    concentration_log_rate,
+    log1p_rate,
+    value,
+):
+    # NB: `rate` only enters through the cached terms; it is passed to determine
+    # the dtype of the result
+    out_dtype = jnp.result_type(concentration, rate, float)
+    dtype = _compute_dtype(out_dtype)
+    concentration = _astype(concentration, dtype)
+    value = _astype(value, dtype)
+    post_value = concentration + value
+    log_prob = (
+        gammaln(post_value)
+        - gammaln(value + 1)
+        - gammaln_concentration
+        + concentration_log_rate
+        - post_value * log1p_rate
+    )
+    return log_prob.astype(out_dtype)
 
 
 class BetaBinomial(Distribution):
@@ -52,28 +293,73 @@ class BetaBinomial(Distribution):
         batch_shape = lax.broadcast_shapes(
             jnp.shape(concentration1), jnp.shape(concentration0), jnp.shape(total_count)
         )
-        concentration1 = jnp.broadcast_to(concentration1, batch_shape)
-        concentration0 = jnp.broadcast_to(concentration0, batch_shape)
-        self._beta = Beta(concentration1, concentration0)
         super(BetaBinomial, self).__init__(batch_shape, validate_args=validate_args)
 
+    @lazy_property
+    def _log_norm(self):
+        # parameter-only terms of the log density, which are shared by all values
+        # (e.g. when enumerating the support):
+        # log(total_count!) - betaln(concentration0, concentration1)
+        # - gammaln(total_count + concentration0 + concentration1)
+        params = (self.concentration1, self.concentration0)
+        concentration1 = _to_compute_dtype(self.concentration1, *params)
+        concentration0 = _to_compute_dtype(self.concentration0, *params)
+        n = _to_compute_dtype(self.total_count, *params)
+        concentration_sum = concentration0 + concentration1
+        return (
+            gammaln(n + 1)
+            + gammaln(concentration_sum)
+            - gammaln(concentration0)
+            - gammaln(concentration1)
+            - gammaln(n + concentration_sum)
+        )
+
+    @lazy_property
+    def _log_factorial(self):
+        # log factorials of 0, ..., max(total_count), available when `total_count`
+        # is concrete and not too large
+        if not not_jax_tracer(self.total_count):
+            return None
+        max_count = int(np.max(self.total_count))
+        if max_count > _MAX_LOG_FACTORIAL_TABLE:
+            return None
+        # NB: this is computed with NumPy so that the cached table is never a tracer
+        return np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_count + 1)))])
+
+    @lazy_property
+    def _beta(self):
+        # only needed for sampling and moments, so we avoid building it in `__init__`
+        concentration1 = jnp.broadcast_to(self.concentration1, self.batch_shape)
+        concentration0 = jnp.broadcast_to(self.concentration0, self.batch_shape)
+        return Beta(concentration1, concentration0)
+
     def sample(self, key, sample_shape=()):
         assert is_prng_key(key)
         key_beta, key_binom = random.split(key)
         probs = self._beta.sample(key_beta, sample_shape)
-        return BinomialProbs(total_count=self.total_count, probs=probs).sample(
-            key_binom
-        )
+        # NB: we call the samplers directly rather than building a discrete
+        # distribution (and promoting its parameters) on every call
+        return binomial(key_binom, probs, n=self.total_count, shape=jnp.shape(probs))
 
     @validate_sample
     def log_prob(self, value):
-        return (
-            -_log_beta_1(self.total_count - value + 1, value)
-            + betaln(
-                value + self.concentration1,
-                self.total_count - value + self.concentration0,
-            )
-            - betaln(self.concentration0, self.concentration1)
+        if jnp.issubdtype(jnp.result_type(value), jnp.integer):
+            log_factorial = self._log_factorial
+            if log_factorial is not None:
+                return _beta_binomial_log_prob_table(
+                    self.concentration1,
+                    self.concentration0,
+                    self.total_count,
+                    self._log_norm,
+                    log_factorial,
+                    jnp.asarray(value),
+                )
+        return _beta_binomial_log_prob(
+            self.concentration1,
+            self.concentration0,
+            self.total_count,
+            self._log_norm,
+            value,
         )
 
     @property
@@ -122,28 +408,48 @@ class DirichletMultinomial(Distribution):
         concentration_shape = batch_shape + jnp.shape(concentration)[-1:]
         (self.concentration,) = promote_shapes(concentration, shape=concentration_shape)
         (self.total_count,) = promote_shapes(total_count, shape=batch_shape)
-        concentration = jnp.broadcast_to(self.concentration, concentration_shape)
-        self._dirichlet = Dirichlet(concentration)
         super().__init__(
-            self._dirichlet.batch_shape,
-            self._dirichlet.event_shape,
+            batch_shape,
+            jnp.shape(concentration)[-1:],
             validate_args=validate_args,
         )
 
+    # parameter-only terms of the log density
+    @lazy_property
+    def _gammaln_concentration(self):
+        return gammaln(_to_compute_dtype(self.concentration, self.concentration))
+
+    @lazy_property
+    def _gammaln_concentration_sum(self):
+        concentration = _to_compute_dtype(self.concentration, self.concentration)
+        return gammaln(concentration.sum(-1))
+
+    @lazy_property
+    def _dirichlet(self):
+        concentration_shape = self.batch_shape + self.event_shape
+        return Dirichlet(jnp.broadcast_to(self.concentration, concentration_shape))
+
     def sample(self, key, sample_shape=()):
         assert is_prng_key(key)
         key_dirichlet, key_multinom = random.split(key)
         probs = self._dirichlet.sample(key_dirichlet, sample_shape)
-        return MultinomialProbs(total_count=self.total_count, probs=probs).sample(
-            key_multinom
-        )
+        return multinomial(key_multinom, probs, self.total_count)
 
     @validate_sample
     def log_prob(self, value):
-        alpha = self.concentration
-        return _log_beta_1(alpha.sum(-1), value.sum(-1)) - _log_beta_1(
-            alpha, value
-        ).sum(-1)
+        num_categories = self.event_shape[-1]
+        if num_categories <= _MAX_UNROLL_CATEGORIES:
+            log_prob_fn = _make_dirichlet_multinomial_log_prob(num_categories)
+        elif num_categories >= _MIN_SCAN_CATEGORIES:
+            log_prob_fn = _dirichlet_multinomial_log_prob_scan
+        else:
+            log_prob_fn = _dirichlet_multinomial_log_prob
+        return log_prob_fn(
+            self.concentration,
+            self._gammaln_concentration,
+            self._gammaln_concentration_sum,
+            value,
+        )
 
     @property
     def mean(self):
@@ -186,25 +492,45 @@ class GammaPoisson(Distribution):
 
     def __init__(self, concentration, rate=1.0, *, validate_args=None):
         self.concentration, self.rate = promote_shapes(concentration, rate)
-        self._gamma = Gamma(concentration, rate)
-        super(GammaPoisson, self).__init__(
-            self._gamma.batch_shape, validate_args=validate_args
-        )
+        batch_shape = lax.broadcast_shapes(jnp.shape(concentration), jnp.shape(rate))
+        super(GammaPoisson, self).__init__(batch_shape, validate_args=validate_args)
+
+    # parameter-only terms of the log density
+    @lazy_property
+    def _gammaln_concentration(self):
+        params = (self.concentration, self.rate)
+        return gammaln(_to_compute_dtype(self.concentration, *params))
+
+    @lazy_property
+    def _concentration_log_rate(self):
+        params = (self.concentration, self.rate)
+        concentration = _to_compute_dtype(self.concentration, *params)
+        return concentration * jnp.log(_to_compute_dtype(self.rate, *params))
+
+    @lazy_property
+    def _log1p_rate(self):
+        params = (self.concentration, self.rate)
+        return jnp.log1p(_to_compute_dtype(self.rate, *params))
+
+    @lazy_property
+    def _gamma(self):
+        return Gamma(self.concentration, self.rate)
 
     def sample(self, key, sample_shape=()):
         assert is_prng_key(key)
         key_gamma, key_poisson = random.split(key)
         rate = self._gamma.sample(key_gamma, sample_shape)
-        return Poisson(rate).sample(key_poisson)
+        return random.poisson(key_poisson, rate)
 
     @validate_sample
     def log_prob(self, value):
-        post_value = self.concentration + value
-        return (
-            -betaln(self.concentration, value + 1)
-            - jnp.log(post_value)
-            + self.concentration * jnp.log(self.rate)
-            - post_value * jnp.log1p(self.rate)
+        return _gamma_poisson_log_prob(
+            self.concentration,
+            self.rate,
+            self._gammaln_concentration,
+            self._concentration_log_rate,
+            self._log1p_rate,
+            value,
         )
 
     @property
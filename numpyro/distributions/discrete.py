@@ -32,11 +32,13 @@ from jax import lax
 from jax.nn import softmax, softplus
 import jax.numpy as jnp
 import jax.random as random
-from jax.scipy.special import expit, gammaincc, gammaln, logsumexp, xlog1py, xlogy
+from jax.scipy.special import expit, gammaincc, gammaln, logsumexp
 
 from numpyro.distributions import constraints, transforms
 from numpyro.distributions.distribution import Distribution
 from numpyro.distributions.util import (
+    _xlog1py_data,
+    _xlogy_data,
     binary_cross_entropy_with_logits,
     binomial,
     categorical,
@@ -89,7 +91,7 @@ class BernoulliProbs(Distribution):
     @validate_sample
     def log_prob(self, value):
         ps_clamped = clamp_probs(self.probs)
-        return xlogy(value, ps_clamped) + xlog1py(1 - value, -ps_clamped)
+        return _xlogy_data(value, ps_clamped) + _xlog1py_data(1 - value, -ps_clamped)
 
     @lazy_property
     def logits(self):
@@ -190,8 +192,8 @@ class BinomialProbs(Distribution):
             log_factorial_n
             - log_factorial_k
             - log_factorial_nmk
-            + xlogy(value, probs)
-            + xlog1py(self.total_count - value, -probs)
+            + _xlogy_data(value, probs)
+            + _xlog1py_data(self.total_count - value, -probs)
         )
 
     @lazy_property
@@ -258,7 +260,7 @@ class BinomialLogits(Distribution):
         log_factorial_nmk = gammaln(self.total_count - value + 1)
         normalize_term = (
             self.total_count * jnp.clip(self.logits, 0)
-            + xlog1py(self.total_count, jnp.exp(-jnp.abs(self.logits)))
+            + _xlog1py_data(self.total_count, jnp.exp(-jnp.abs(self.logits)))
             - log_factorial_n
         )
         return (
@@ -530,7 +532,7 @@ class MultinomialProbs(Distribution):
         if self._validate_args:
             self._validate_sample(value)
         return gammaln(self.total_count + 1) + jnp.sum(
-            xlogy(value, self.probs) - gammaln(value + 1), axis=-1
+            _xlogy_data(value, self.probs) - gammaln(value + 1), axis=-1
         )
 
     @lazy_property
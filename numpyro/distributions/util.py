@@ -414,6 +414,19 @@ def clamp_probs(probs):
     return jnp.clip(probs, a_min=finfo.tiny, a_max=1.0 - finfo.eps)
 
 
+def _xlogy_data(x, y):
+    # computes x * log(y), which is zero where x is zero; unlike
+    # `jax.scipy.special.xlogy`, log(y) is never evaluated at the masked entries,
+    # so the value and the gradient w.r.t. y are free of NaNs there. The gradient
+    # w.r.t. x is zero (not log(y)) where x is zero, so x must be data (e.g. counts)
+    return x * jnp.log(jnp.where(x == 0, 1.0, y))
+
+
+def _xlog1py_data(x, y):
+    # computes x * log1p(y), which is zero where x is zero; see `_xlogy_data`
+    return x * jnp.log1p(jnp.where(x == 0, 0.0, y))
+
+
 def betainc(a, b, x):
     try:
         from tensorflow_probability.substrates.jax.math import betainc as betainc_fn
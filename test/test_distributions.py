@@ -1407,6 +1407,25 @@ def test_beta_binomial_log_prob(total_count, shape):
     assert_allclose(actual, expected, rtol=0.02)
 
 
+def test_beta_binomial_log_prob_table():
+    concentration1 = np.exp(np.random.normal(size=(3,)))
+    concentration0 = np.exp(np.random.normal(size=(3,)))
+    total_count = np.array([5, 10, 20])
+    value = np.arange(21)[:, None]
+    d = dist.BetaBinomial(concentration1, concentration0, total_count)
+    actual = d.log_prob(value)
+    expected = osp.betabinom.logpmf(value, total_count, concentration1, concentration0)
+    assert_allclose(actual, expected, rtol=1e-5)
+    assert_allclose(actual, d.log_prob(value.astype(float)), rtol=1e-5)
+
+    # total_count does not fit in narrow count dtypes
+    d = dist.BetaBinomial(2.0, 3.0, 300)
+    expected = osp.betabinom.logpmf(np.array([0, 100, 255]), 300, 2.0, 3.0)
+    for dtype in [np.uint8, np.int16]:
+        value = np.array([0, 100, 255], dtype=dtype)
+        assert_allclose(d.log_prob(value), expected, rtol=1e-5)
+
+
 @pytest.mark.parametrize("total_count", [1, 2, 3, 10])
 @pytest.mark.parametrize("batch_shape", [(1,), (3, 1), (2, 3, 1)])
 def test_dirichlet_multinomial_log_prob(total_count, batch_shape):
@@ -1426,6 +1445,113 @@ def test_dirichlet_multinomial_log_prob(total_count, batch_shape):
     assert_allclose(actual, expected, rtol=0.05)
 
 
+def _dirichlet_multinomial_log_prob_reference(concentration, value):
+    total_count = value.sum(-1)
+    alpha_sum = concentration.sum(-1)
+    return (
+        scipy.special.gammaln(alpha_sum)
+        + scipy.special.gammaln(total_count + 1)
+        - scipy.special.gammaln(total_count + alpha_sum)
+        + (
+            scipy.special.gammaln(value + concentration)
+            - scipy.special.gammaln(concentration)
+            - scipy.special.gammaln(value + 1)
+        ).sum(-1)
+    )
+
+
+def test_dirichlet_multinomial_log_prob_sparse():
+    concentration = np.exp(np.random.normal(size=(4, 20)))
+    value = np.random.poisson(0.3, size=(4, 20))
+    total_count = value.sum(-1)
+    expected = _dirichlet_multinomial_log_prob_reference(concentration, value)
+    d = dist.DirichletMultinomial(concentration, total_count)
+    assert_allclose(d.log_prob(value), expected, rtol=1e-5)
+    g = grad(lambda c: dist.DirichletMultinomial(c, total_count).log_prob(value).sum())
+    assert np.isfinite(g(concentration)).all()
+
+
+def test_dirichlet_multinomial_log_prob_grad_small_concentration():
+    concentration = np.array([1e-10, 1.0, 2.0])
+    value = np.array([3, 0, 5])
+    actual = grad(lambda c: dist.DirichletMultinomial(c, 8).log_prob(value))(
+        concentration
+    )
+    alpha_sum = concentration.sum()
+    expected = (
+        scipy.special.digamma(alpha_sum)
+        - scipy.special.digamma(8 + alpha_sum)
+        + np.where(
+            value != 0,
+            scipy.special.digamma(value + concentration)
+            - scipy.special.digamma(concentration),
+            0.0,
+        )
+    )
+    assert_allclose(actual, expected, rtol=1e-4)
+
+
+def test_negative_binomial_logits_grad_small_total_count():
+    value = np.array([3, 0, 5])
+    g = grad(lambda n: dist.NegativeBinomialLogits(n, 0.3).log_prob(value).sum())
+    assert np.isfinite(g(1e-10))
+
+
+@pytest.mark.parametrize("num_categories", [2, 16, 17])
+def test_dirichlet_multinomial_log_prob_unrolled(num_categories):
+    concentration = np.exp(np.random.normal(size=(3, num_categories)))
+    value = np.random.poisson(2.0, size=(5, 3, num_categories))
+    total_count = value.sum(-1)
+    expected = _dirichlet_multinomial_log_prob_reference(concentration, value)
+    d = dist.DirichletMultinomial(concentration, total_count)
+    # rows without any counts have a log density of exactly zero
+    assert_allclose(d.log_prob(value), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_dirichlet_multinomial_log_prob_large_concentration():
+    concentration = np.array([0.5, 10.0, 29.0, 31.0, 100.0, 1e4])
+    value = np.array([3, 50, 0, 7, 1000, 123])
+    total_count = value.sum(-1)
+    expected = _dirichlet_multinomial_log_prob_reference(concentration, value)
+    d = dist.DirichletMultinomial(concentration, total_count)
+    assert_allclose(d.log_prob(value), expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize("batch_shape", [(), (4,), (2, 4)])
+def test_dirichlet_multinomial_log_prob_large_num_categories(batch_shape):
+    concentration = np.exp(np.random.normal(size=(1100,)))
+    value = np.random.poisson(0.3, size=batch_shape + (1100,))
+    expected = _dirichlet_multinomial_log_prob_reference(concentration, value)
+    d = dist.DirichletMultinomial(concentration, value.sum(-1))
+    assert_allclose(d.log_prob(value), expected, rtol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "jax_dist, params, value",
+    [
+        (dist.BetaBinomial, (2.0, 5.0, 10), np.arange(11)),
+        (dist.BetaBinomial, (2.0, 5.0, 1000), np.array([0.0, 300.0, 999.0])),
+        (
+            dist.DirichletMultinomial,
+            (np.array([1.0, 2.0, 3.9]), 10),
+            np.array([2, 0, 8]),
+        ),
+        (dist.GammaPoisson, (2.0, 2.0), np.array([0, 1, 5, 14, 300])),
+    ],
+)
+def test_conjugate_log_prob_dtype(jax_dist, params, value):
+    low_precision_params = tuple(
+        jnp.asarray(p, dtype=jnp.bfloat16) if isinstance(p, (float, np.ndarray)) else p
+        for p in params
+    )
+    actual = jax_dist(*low_precision_params).log_prob(value)
+    assert actual.dtype == jnp.bfloat16
+    # the log density is evaluated in float32 and only rounded to bfloat16 at the
+    # end, so it keeps bfloat16 precision even for counts above 256
+    expected = jax_dist(*params).log_prob(value)
+    assert_allclose(actual.astype(expected.dtype), expected, rtol=2e-2, atol=1e-2)
+
+
 @pytest.mark.parametrize("shape", [(1,), (3, 1), (2, 3, 1)])
 def test_gamma_poisson_log_prob(shape):
     gamma_conc = np.exp(np.random.normal(size=shape))
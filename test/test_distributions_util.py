@@ -8,11 +8,13 @@ from numpy.testing import assert_allclose
 import pytest
 import scipy
 
-from jax import lax, random, vmap
+from jax import grad, lax, random, vmap
 import jax.numpy as jnp
 from jax.scipy.special import expit, xlog1py, xlogy
 
 from numpyro.distributions.util import (
+    _xlog1py_data,
+    _xlogy_data,
     binary_cross_entropy_with_logits,
     binomial,
     categorical,
@@ -31,6 +33,18 @@ def test_binary_cross_entropy_with_logits(x, y):
     assert_allclose(actual, expect, rtol=1e-6)
 
 
+@pytest.mark.parametrize(
+    "prim, data_prim, y", [(xlogy, _xlogy_data, 0.0), (xlog1py, _xlog1py_data, -1.0)]
+)
+def test_xlogy_data(prim, data_prim, y):
+    x = np.array([0.0, 0.0, 2.0, 3.0])
+    y = np.array([y, 0.5, 0.5, 4.0])
+    assert_allclose(data_prim(x, y), prim(x, y), rtol=1e-6)
+    g = grad(lambda y: data_prim(x, y).sum())(y)
+    assert np.isfinite(g).all()
+    assert_allclose(g[:2], 0.0)
+
+
 @pytest.mark.parametrize("prim", [xlogy, xlog1py])
 def test_binop_batch_rule(prim):
     bx = np.array([1.0, 2.0, 3.0])